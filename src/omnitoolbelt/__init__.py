@@ -10,5 +10,5 @@ from ._version import version as __version__
 
 __all__ = ["__version__",'Toolbelt']
 
-from .toolbelt import Toolbelt, APIOMORPHIC_AVAILABLE
+from .toolbelt import Toolbelt, APIOMORPHIC_AVAILABLE, NUMBA_AVAILABLE
 
@@ -1,20 +1,49 @@
-from typing import Any, Callable, Dict, Optional, List, Tuple, Union, get_type_hints
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    Optional,
+    List,
+    Tuple,
+    Union,
+    get_type_hints,
+)
+import importlib.util
 import inspect
-from functools import wraps
+import os
+from functools import lru_cache, wraps
+from operator import attrgetter
 import asyncio
 from dataclasses import dataclass
+import sys
+import threading
 import warnings
+import weakref
 
-try:
-    from apiomorphic import ApiFormat, format_tool_schema
+# apiomorphic is only imported once a formatted schema is requested
+APIOMORPHIC_AVAILABLE = importlib.util.find_spec("apiomorphic") is not None
 
-    APIOMORPHIC_AVAILABLE = True
-except ImportError:
-    APIOMORPHIC_AVAILABLE = False
-    ApiFormat = Any
+if TYPE_CHECKING:
+    from apiomorphic import ApiFormat
 
 
-@dataclass
+# numba is only imported by tools registered with jit=True
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# Parameter types numba can compile without object mode
+_NUMBA_SCALAR_TYPES = (int, float, bool)
+
+
+# dataclass(slots=True) requires Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ToolDefinition:
     """Defines a callable tool.
 
@@ -22,6 +51,10 @@ class ToolDefinition:
         callable: The actual Python function to execute
         description: A clear description for the user about what the tool does
         parameters: JSON schema defining the expected parameters structure
+        is_async: Whether callable must be awaited, resolved once at registration
+        qualified_name: The group-qualified name the tool is registered under
+        inline: Whether execute_async calls a sync callable on the event loop
+            rather than in a worker thread
     """
 
     callable: Callable[..., Any]
@@ -29,100 +62,319 @@ class ToolDefinition:
     parameters: Dict[str, Any]  # JSON Schema structure
     source_file_path: Optional[str]
     source_line_index: Optional[int]
+    is_async: bool
+    qualified_name: str
+    inline: bool
 
     def __post_init__(self):
         # Validate that parameters contains a valid JSON schema structure
-        required_schema_keys = {"type", "properties"}
-        if not all(key in self.parameters for key in required_schema_keys):
+        parameters = self.parameters
+        if "type" not in parameters or "properties" not in parameters:
             raise ValueError("parameters must contain a valid JSON schema")
 
 
-def get_func_description(func):
-    return (inspect.getdoc(func) or "",)
+def get_func_description(func: Callable) -> str:
+    # Interned so every structure holding a description shares one str object
+    return sys.intern(inspect.getdoc(func) or "")
+
+
+_PY_TO_JSON: Dict[type, str] = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
 
 
 def get_json_type(typ: Any) -> str:
     """Convert Python type to JSON schema type"""
-    return {
-        str: "string",
-        int: "integer",
-        float: "number",
-        bool: "boolean",
-        list: "array",
-        dict: "object",
-    }.get(typ, "string")
+    return _PY_TO_JSON.get(typ, "string")
+
+
+# Weakly keyed so reloaded or discarded functions are not kept alive
+_type_hints_cache: "weakref.WeakKeyDictionary[Callable, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _cached_type_hints(func: Callable) -> Dict[str, Any]:
+    """Resolve type hints once per function; callers must not mutate the result"""
+    try:
+        return _type_hints_cache[func]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable or non-weakrefable callables are resolved uncached
+        return get_type_hints(func)
+    hints = _type_hints_cache[func] = get_type_hints(func)
+    return hints
+
+
+def _annotated_callable(func: Callable) -> Callable:
+    """Return the function whose annotations describe calling func"""
+    if inspect.isroutine(func) or inspect.isclass(func):
+        return func
+    # Callable objects: an instance resolves __annotations__ to its class
+    # attributes, so describe the arguments of __call__ instead
+    return type(func).__call__
+
+
+def _func_type_hints(func: Callable) -> Dict[str, Any]:
+    """Type hints for calling func, cached; callers must not mutate the result"""
+    target = _annotated_callable(func)
+    if not getattr(target, "__annotations__", None):
+        return {}
+    return _cached_type_hints(target)
 
 
 def get_func_parameters(func):
     # Generate parameter schema from type hints
-    hints = get_type_hints(func)
-    if "return" in hints:
-        del hints["return"]
+    hints = {
+        param: typ
+        for param, typ in _func_type_hints(func).items()
+        if param != "return"
+    }
 
     return {
         "type": "object",
         "properties": {
-            param: {"type": get_json_type(typ)} for param, typ in hints.items()
+            param: {"type": _PY_TO_JSON.get(typ, "string")}
+            for param, typ in hints.items()
         },
-        "required": list(hints.keys()),
+        "required": list(hints),
     }
 
 
+def _make_wrapper(
+    func: Callable,
+    tool_name: str,
+    is_async: bool,
+    wrapped: Optional[Callable] = None,
+) -> Callable:
+    """Build the tool wrapper, async only when func itself must be awaited
+
+    The wrapper takes its name and docstring from wrapped, which defaults to func.
+    """
+    if wrapped is None:
+        wrapped = func
+    if is_async:
+
+        @wraps(wrapped)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                return f"Error: {tool_name}: {str(e)}"
+
+        return async_wrapper
+
+    @wraps(wrapped)
+    def sync_wrapper(*args, **kwargs) -> Any:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            return f"Error: {tool_name}: {str(e)}"
+
+    return sync_wrapper
+
+
+def _jit_compile(func: Callable, qualified_name: str, is_async: bool) -> Callable:
+    """Compile func with numba.njit where possible
+
+    Returns func unchanged, with a RuntimeWarning, when numba is not installed or
+    the signature is unsuitable. If numba fails to compile the body on a call,
+    that call and every later one run the uncompiled func instead.
+    """
+    if not NUMBA_AVAILABLE:
+        warnings.warn(
+            f'Tool "{qualified_name}" is not compiled: jit=True needs the numba '
+            "package. Install it with: pip install omnitoolbelt[jit]",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        return func
+    hints = _func_type_hints(func)
+    parameters = inspect.signature(func).parameters
+    if is_async or not all(
+        hints.get(param) in _NUMBA_SCALAR_TYPES for param in parameters
+    ):
+        warnings.warn(
+            f'Tool "{qualified_name}" is not compiled: jit=True needs a sync '
+            "function whose parameters are all annotated as int, float or bool",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        return func
+
+    import numba
+    from numba.core.errors import NumbaError
+
+    # No explicit signature, so compilation is deferred to the first call
+    target: Callable
+    try:
+        target = numba.njit(cache=True)(func)
+    except RuntimeError:
+        # No cache locator, e.g. for code from exec, python -c or a REPL
+        target = numba.njit()(func)
+
+    def call(*args, **kwargs) -> Any:
+        nonlocal target
+        if target is func:
+            return func(*args, **kwargs)
+        try:
+            return target(*args, **kwargs)
+        except NumbaError as e:
+            warnings.warn(
+                f'Tool "{qualified_name}" could not be compiled and now runs '
+                f"uncompiled: {e}",
+                RuntimeWarning,
+            )
+            target = func
+            return func(*args, **kwargs)
+
+    return call
+
+
+async def _return(value: Any) -> Any:
+    return value
+
+
+async def _call_inline(func: Callable, kwargs: Dict[str, Any]) -> Any:
+    return func(**kwargs)
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_thread: Optional[threading.Thread] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop shared by sync calls to async tools, starting it on first use"""
+    global _background_loop, _background_thread
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="omnitoolbelt-loop", daemon=True
+                )
+                thread.start()
+                _background_thread = thread
+                _background_loop = loop
+    return _background_loop
+
+
+def _reset_background_loop() -> None:
+    """Forget the parent's loop in a forked child, where its thread does not exist"""
+    global _background_loop, _background_thread, _background_loop_lock
+    _background_loop = _background_thread = None
+    _background_loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_background_loop)
+
+
+@lru_cache(maxsize=None)
+def _format_tool_schema() -> Callable[..., Any]:
+    """Import apiomorphic's schema formatter on first use"""
+    from apiomorphic import format_tool_schema
+
+    return format_tool_schema
+
+
+# Attribute caching (description, is_async) on registered functions
+_META_ATTR = "_omnitoolbelt_meta"
+
+
+# (name, description, parameters) tuple for a ToolDefinition, as returned by get_tools
+_tool_info = attrgetter("qualified_name", "description", "parameters")
+
+
 class Toolbelt:
     """Registry and executor for callable tools"""
 
-    def __init__(self):
-        self._tool_definitions: Dict[str, ToolDefinition]
+    _python_type_to_json = staticmethod(get_json_type)
 
-    def tool(self, name: Optional[str] = None) -> Callable:
-        """Register a function as an callable tool"""
+    # Qualified name -> definition; the only table consulted on dispatch
+    _tool_definitions: Dict[str, ToolDefinition] = {}
+    # Unqualified name -> qualified name in the earliest-created group having it
+    _unqualified: Dict[str, str] = {}
+    # Group -> qualified names in registration order, only used by get_tools
+    _groups: Dict[str, List[str]] = {}
+
+    @classmethod
+    def tool(
+        cls,
+        group: str = "default",
+        name: Optional[str] = None,
+        inline: bool = False,
+        jit: bool = False,
+    ) -> Callable:
+        """Register a function as an callable tool within the given group
+
+        Sync functions stay sync. When executed asynchronously they are run in a
+        worker thread unless inline is True, in which case they are called
+        directly on the event loop. Only use inline for functions that return
+        quickly and never block.
+
+        With jit=True, sync functions taking only int, float and bool parameters
+        are compiled with numba.njit on first call. Without numba (the jit extra),
+        or when numba cannot compile the function, it runs uncompiled and a
+        RuntimeWarning is issued.
+        """
 
         def decorator(func: Callable) -> Callable:
-            nonlocal name
-            if name is None:
-                name = func.__name__
+            tool_name = func.__name__ if name is None else name
+            qualified_name = f"{group}.{tool_name}"
 
             source_file_path = source_line_index = None
             try:
-                frame = inspect.currentframe()
-                if frame is not None:
-                    frame = frame.f_back
-                    if frame is not None:
-                        source_file_path = frame.f_code.co_filename
-                source_line_index = frame.f_lineno
-            except Exception as e:
+                # sys._getframe is a CPython implementation detail (PyPy has it
+                # too); frame 1 is the caller applying the decorator
+                frame = sys._getframe(1)
+            except (AttributeError, ValueError) as e:
                 warnings.warn(
-                    f'Failed to get source location for tool ="{name}": {str(e)}',
+                    f'Failed to get source location for tool ="{qualified_name}": {str(e)}',
                     RuntimeWarning,
                 )
-            finally:
-                if frame is not None:
-                    del frame
-            if name in self._tool_definitions:
-                existing = self._tool_definitions[name]
+            else:
+                source_file_path = frame.f_code.co_filename
+                source_line_index = frame.f_lineno
+                del frame
+            if qualified_name in cls._tool_definitions:
+                existing = cls._tool_definitions[qualified_name]
                 old_location_msg = (
                     f"{existing.source_file_path}:{existing.source_line_index}"
                 )
                 new_location_msg = f"{source_file_path}:{source_line_index}"
                 warnings.warn(
-                    f'Tool "{name}" defined at {old_location_msg} is being overwritten by definition at {new_location_msg}\n',
+                    f'Tool "{qualified_name}" defined at {old_location_msg} is being overwritten by definition at {new_location_msg}\n',
                     UserWarning,
                     stacklevel=2,
                 )
 
-            description = get_func_description(func)
+            meta = getattr(func, _META_ATTR, None)
+            if meta is None:
+                meta = (get_func_description(func), is_async_callable(func))
+                try:
+                    setattr(func, _META_ATTR, meta)
+                except AttributeError:
+                    # e.g. bound methods and builtins reject new attributes
+                    pass
+            description, func_is_async = meta
+            # Built fresh per definition so edits to one schema never leak into
+            # another; the hints it is built from are already cached
             parameters = get_func_parameters(func)
 
-            @wraps(func)
-            async def wrapper(*args, **kwargs) -> Any:
-                try:
-                    if inspect.iscoroutinefunction(func):
-                        result = await func(*args, **kwargs)
-                    else:
-                        result = await asyncio.to_thread(func, *args, **kwargs)
-                    return result
-                except Exception as e:
-                    return f"Error: {name}: {str(e)}"
+            target = (
+                _jit_compile(func, qualified_name, func_is_async) if jit else func
+            )
+            wrapper = _make_wrapper(target, tool_name, func_is_async, wrapped=func)
+            # wraps() copies func.__dict__, but the metadata describes func only
+            vars(wrapper).pop(_META_ATTR, None)
 
             tool_definition = ToolDefinition(
                 callable=wrapper,
@@ -130,14 +382,37 @@ class Toolbelt:
                 parameters=parameters,
                 source_file_path=source_file_path,
                 source_line_index=source_line_index,
+                is_async=func_is_async,
+                inline=inline,
+                qualified_name=qualified_name,
             )
-            self._tool_definitions[name] = tool_definition
+            if qualified_name not in cls._tool_definitions:
+                cls._groups.setdefault(group, []).append(qualified_name)
+            cls._tool_definitions[qualified_name] = tool_definition
+            cls._index_unqualified(tool_name, group, qualified_name)
             return wrapper
 
         return decorator
 
+    @classmethod
+    def _index_unqualified(
+        cls, tool_name: str, group: str, qualified_name: str
+    ) -> None:
+        """Point tool_name at the tool from the earliest-created group defining it"""
+        existing = cls._unqualified.get(tool_name)
+        if existing is not None:
+            existing_group = existing[: -len(tool_name) - 1]
+            group_order = list(cls._groups)
+            if group_order.index(existing_group) <= group_order.index(group):
+                return
+        cls._unqualified[tool_name] = qualified_name
+
+    @classmethod
     def get_tools(
-        api_format: Optional[ApiFormat] = None, strict: bool = False
+        cls,
+        groups: Optional[List[str]] = None,
+        api_format: Optional["ApiFormat"] = None,
+        strict: bool = False,
     ) -> Union[List[Tuple[str, str, Dict[str, Any]]], Dict[str, Any]]:
         """
         Get tool information, optionally filtered by groups and formatted for specific API
@@ -156,25 +431,19 @@ class Toolbelt:
             ImportError: If api_format is specified but apiomorphic package is not installed
         """
         # Collect raw tool information
-        tools = []
+        tools: List[Tuple[str, str, Dict[str, Any]]] = []
 
-        # Determine which groups to include
+        # Determine which groups to include, keeping the caller's order
+        relevant_groups: Iterable[str]
         if groups is None:
-            relevant_groups = cls._tools.keys()
+            relevant_groups = cls._groups.keys()
         else:
-            relevant_groups = [g for g in groups if g in cls._tools]
+            relevant_groups = filter(cls._groups.__contains__, groups)
 
         # Collect tools from relevant groups
+        definition_for = cls._tool_definitions.__getitem__
         for group in relevant_groups:
-            for name in cls._tools[group]:
-                qualified_name = f"{group}.{name}"
-                tools.append(
-                    (
-                        qualified_name,
-                        cls._descriptions[qualified_name],
-                        cls._parameters[qualified_name],
-                    )
-                )
+            tools.extend(map(_tool_info, map(definition_for, cls._groups[group])))
 
         # Return raw tools if no format specified
         if api_format is None:
@@ -187,74 +456,81 @@ class Toolbelt:
                 "Install it with: pip install apiomorphic"
             )
 
-        return format_tool_schema(api_format, tools, strict=strict)
+        return _format_tool_schema()(api_format, tools, strict=strict)
 
     @classmethod
-    def _parse_tool_name(cls, name: str) -> Tuple[str, str]:
-        """Parse a tool name into group and function name"""
-        if "." in name:
-            group, func_name = name.split(".", 1)
-            return group, func_name
-        else:
-            # Search all groups for the function name
-            for group, funcs in cls._tools.items():
-                if name in funcs:
-                    return group, name
-        raise ValueError(f"Tool not found: {name}")
+    def _find_tool(cls, name: str) -> Optional[ToolDefinition]:
+        """Look up a tool by qualified or unqualified name, or None if unknown"""
+        tool_definition = cls._tool_definitions.get(name)
+        if tool_definition is None and name in cls._unqualified:
+            tool_definition = cls._tool_definitions[cls._unqualified[name]]
+        return tool_definition
 
     @classmethod
-    async def execute_async(cls, name: str, **kwargs) -> Any:
+    def execute_async(cls, name: str, **kwargs) -> Coroutine[Any, Any, Any]:
         """
         Execute a tool by name with given arguments asynchronsouly.
         Name can be either 'function_name' or 'group.function_name'
 
+        Returns a coroutine to await. For async tools this is the tool's own
+        coroutine, so no extra coroutine frame is layered on top of it. Sync
+        tools run in a worker thread unless registered with inline=True.
+
         Args:
             name: Name of the tool to execute (with optional group prefix)
             **kwargs: Arguments to pass to the tool
 
         Returns:
-            The result of the tool execution
-
-        Raises:
-            ValueError: If the tool is not found
+            The result of the tool execution, or an error message if the tool
+            is not found or fails
         """
-        try:
-            group, func_name = cls._parse_tool_name(name)
-            if group in cls._tools and func_name in cls._tools[group]:
-                if is_async_callable(func := cls._tools[group][func_name]):
-                    return await func(**kwargs)
-                else:
-                    return func(**kwargs)
-            return f"Error: Unknown tool '{name}'"
-        except Exception as e:
-            return f"Error: {str(e)}"
+        tool_definition = cls._find_tool(name)
+        if tool_definition is None:
+            return _return(f"Error: Unknown tool '{name}'")
+        if tool_definition.is_async:
+            # The wrapper already turns tool exceptions into error messages
+            return tool_definition.callable(**kwargs)
+        if tool_definition.inline:
+            return _call_inline(tool_definition.callable, kwargs)
+        return asyncio.to_thread(tool_definition.callable, **kwargs)
 
     @classmethod
     def execute_sync(cls, name: str, **kwargs) -> Any:
         """
         Execute a tool by name with given arguments synchronously.
         For sync functions, executes directly.
-        For async functions, runs them in a new event loop.
+        For async functions, runs them on a shared background event loop.
         Name can be either 'function_name' or 'group.function_name'
 
+        The background loop runs in a single thread, so async tools called from
+        many threads at once interleave on that loop rather than running in
+        parallel. Async tools must not call execute_sync for other async tools;
+        use execute_async there instead.
+
         Args:
             name: Name of the tool to execute (with optional group prefix)
             **kwargs: Arguments to pass to the tool
 
         Returns:
-            The result of the tool execution
-
-        Raises:
-            ValueError: If the tool is not found
+            The result of the tool execution, or an error message if the tool
+            is not found or fails
         """
-        try:
-            group, func_name = cls._parse_tool_name(name)
-            if group in cls._tools and func_name in cls._tools[group]:
-                if is_async_callable(func := cls._tools[group][func_name]):
-                    return asyncio.run(func(**kwargs))
-                else:
-                    return func(**kwargs)
+        tool_definition = cls._find_tool(name)
+        if tool_definition is None:
             return f"Error: Unknown tool '{name}'"
+        on_background_loop = threading.current_thread() is _background_thread
+        if tool_definition.is_async and on_background_loop:
+            # Blocking the loop thread on its own future would never resolve
+            return (
+                f"Error: Cannot execute async tool '{name}' synchronously from "
+                "inside another tool, use execute_async instead"
+            )
+        try:
+            if tool_definition.is_async:
+                return asyncio.run_coroutine_threadsafe(
+                    tool_definition.callable(**kwargs), _get_background_loop()
+                ).result()
+            return tool_definition.callable(**kwargs)
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -5,8 +5,14 @@ import importlib.metadata
 import omnitoolbelt as m
 
 import pytest
-from omnitoolbelt import Toolbelt, APIOMORPHIC_AVAILABLE
+from omnitoolbelt import Toolbelt, APIOMORPHIC_AVAILABLE, NUMBA_AVAILABLE
+from omnitoolbelt.toolbelt import ToolDefinition, get_func_parameters
 import asyncio
+import gc
+import sys
+import threading
+import weakref
+from dataclasses import dataclass
 
 
 def test_version():
@@ -38,6 +44,12 @@ async def echo(message: str) -> str:
     return message
 
 
+@Toolbelt.tool(group="fast", inline=True)
+def thread_name() -> str:
+    """Report the thread the tool runs on"""
+    return threading.current_thread().name
+
+
 # Helper to run async tests
 async def async_test(coro):
     return await coro
@@ -46,15 +58,103 @@ async def async_test(coro):
 def test_tool_registration():
     """Test that tools are properly registered"""
     # Check group registration
-    assert "math" in Toolbelt._tools
-    assert "text" in Toolbelt._tools
-    assert "default" in Toolbelt._tools
+    assert "math" in Toolbelt._groups
+    assert "text" in Toolbelt._groups
+    assert "default" in Toolbelt._groups
 
     # Check function registration
-    assert "add" in Toolbelt._tools["math"]
-    assert "multiply" in Toolbelt._tools["math"]
-    assert "uppercase" in Toolbelt._tools["text"]
-    assert "echo" in Toolbelt._tools["default"]
+    assert "math.add" in Toolbelt._groups["math"]
+    assert "math.multiply" in Toolbelt._groups["math"]
+    assert "text.uppercase" in Toolbelt._groups["text"]
+    assert "default.echo" in Toolbelt._groups["default"]
+    assert "math.add" in Toolbelt._tool_definitions
+
+
+def test_tool_source_location():
+    """Test that tools record where they were registered"""
+    definition = Toolbelt._tool_definitions["math.add"]
+    assert definition.source_file_path == __file__
+    assert definition.source_line_index is not None
+
+
+@dataclass
+class Scaler:
+    """Scale a value by a fixed factor"""
+
+    factor: float
+
+    async def __call__(self, value: float) -> float:
+        return value * self.factor
+
+
+def test_type_hints_for_unhashable_callable():
+    """Test that unhashable callables still get a parameter schema"""
+    schema = get_func_parameters(Scaler(2.0))
+    assert schema["properties"] == {"value": {"type": "number"}}
+    assert schema["required"] == ["value"]
+
+
+def test_type_hints_cache_does_not_keep_functions_alive():
+    """Test that cached type hints do not pin discarded functions"""
+
+    def temporary(value: int) -> int:
+        return value
+
+    assert get_func_parameters(temporary)["required"] == ["value"]
+    ref = weakref.ref(temporary)
+    del temporary
+    gc.collect()
+    assert ref() is None
+
+
+def test_register_unhashable_callable():
+    """Test that unhashable callable objects can be registered and executed"""
+    Toolbelt.tool(group="objects", name="double")(Scaler(2.0))
+    assert Toolbelt._tool_definitions["objects.double"].parameters["required"] == [
+        "value"
+    ]
+    assert Toolbelt.execute_sync("objects.double", value=3) == 6
+
+
+def test_tool_meta_reused_on_redecoration():
+    """Test that registering the same function again reuses its metadata"""
+
+    def scale(value: float, factor: float) -> float:
+        """Scale a value"""
+        return value * factor
+
+    Toolbelt.tool(group="meta_first")(scale)
+    meta = scale._omnitoolbelt_meta
+    Toolbelt.tool(group="meta_second")(scale)
+    assert scale._omnitoolbelt_meta is meta
+
+    # Definitions get equal but independent schemas
+    first = Toolbelt._tool_definitions["meta_first.scale"].parameters
+    second = Toolbelt._tool_definitions["meta_second.scale"].parameters
+    assert first == second
+    assert first is not second
+    assert first["properties"] is not second["properties"]
+
+
+def test_tool_definition_rejects_invalid_schema():
+    """Test that a parameters dict missing schema keys is rejected"""
+    with pytest.raises(ValueError, match="valid JSON schema"):
+        ToolDefinition(
+            callable=echo,
+            description="",
+            parameters={"type": "object"},
+            source_file_path=None,
+            source_line_index=None,
+            is_async=True,
+            qualified_name="default.invalid",
+            inline=False,
+        )
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+def test_tool_definition_uses_slots():
+    """Test that tool definitions do not carry a per-instance __dict__"""
+    assert not hasattr(Toolbelt._tool_definitions["math.add"], "__dict__")
 
 
 def test_get_tools_no_format():
@@ -72,8 +172,11 @@ def test_get_tools_no_format():
     assert "text.uppercase" in tool_names
     assert "default.echo" in tool_names
 
-    # Check parameter schemas
+    # Check descriptions
     add_tool = next(t for t in tools if t[0] == "math.add")
+    assert add_tool[1] == "Add two numbers"
+
+    # Check parameter schemas
     assert add_tool[2]["properties"]["a"]["type"] == "number"
     assert add_tool[2]["properties"]["b"]["type"] == "number"
     assert set(add_tool[2]["required"]) == {"a", "b"}
@@ -92,6 +195,10 @@ def test_get_tools_filtered():
     assert len(math_tools) == 2
     assert len(text_tools) == 1
 
+    # Groups are returned in the requested order, unknown groups are ignored
+    combined = Toolbelt.get_tools(groups=["text", "missing", "math"])
+    assert [t[0] for t in combined] == text_names + math_names
+
 
 def test_group_qualified_names():
     """Test that group qualified names work correctly"""
@@ -101,8 +208,9 @@ def test_group_qualified_names():
     for name, _, _ in tools:
         assert "." in name
         group, func = name.split(".")
-        assert group in Toolbelt._tools
-        assert func in Toolbelt._tools[group]
+        assert group in Toolbelt._groups
+        assert name in Toolbelt._groups[group]
+        assert Toolbelt._find_tool(func) is not None
 
 
 @pytest.mark.skipif(not APIOMORPHIC_AVAILABLE, reason="apiomorphic not installed")
@@ -126,6 +234,80 @@ def test_api_formats():
         assert "input_schema" in tool
 
 
+@pytest.mark.skipif(APIOMORPHIC_AVAILABLE, reason="apiomorphic installed")
+def test_api_formats_require_apiomorphic():
+    """Test that formatted schemas fail clearly without apiomorphic"""
+    with pytest.raises(ImportError, match="apiomorphic"):
+        Toolbelt.get_tools(api_format="openai")
+
+
+def test_jit_without_numba(monkeypatch):
+    """Test that jit=True falls back to plain Python without numba"""
+    monkeypatch.setattr("omnitoolbelt.toolbelt.NUMBA_AVAILABLE", False)
+
+    def square(x: float) -> float:
+        return x * x
+
+    with pytest.warns(RuntimeWarning, match="numba"):
+        Toolbelt.tool(group="jit", jit=True)(square)
+    assert Toolbelt.execute_sync("jit.square", x=3.0) == 9.0
+
+
+@pytest.fixture
+def numba_cache_dir(tmp_path, monkeypatch):
+    """Keep numba's on-disk cache for jit test tools out of the source tree"""
+    import numba
+
+    monkeypatch.setattr(numba.config, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_jit_tool(numba_cache_dir):
+    """Test jit compilation of numeric tools (when numba is available)"""
+
+    def cube(x: float) -> float:
+        """Cube a number"""
+        return x * x * x
+
+    def shout(text: str) -> str:
+        return text.upper()
+
+    cube_tool = Toolbelt.tool(group="jit", jit=True)(cube)
+    assert cube_tool.__doc__ == "Cube a number"
+    assert Toolbelt.execute_sync("jit.cube", x=3.0) == 27.0
+
+    with pytest.warns(RuntimeWarning, match="not compiled"):
+        Toolbelt.tool(group="jit", jit=True)(shout)
+    assert Toolbelt.execute_sync("jit.shout", text="hi") == "HI"
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_jit_tool_without_source_file():
+    """Test jit registration of functions numba cannot cache, e.g. from exec"""
+    namespace = {}
+    exec(
+        "def hypotenuse(a: float, b: float) -> float:\n"
+        "    return (a * a + b * b) ** 0.5\n",
+        namespace,
+    )
+    Toolbelt.tool(group="jit", jit=True)(namespace["hypotenuse"])
+    assert Toolbelt.execute_sync("jit.hypotenuse", a=3.0, b=4.0) == 5.0
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_jit_tool_falls_back_when_uncompilable(numba_cache_dir):
+    """Test that a body numba cannot type runs uncompiled instead of failing"""
+
+    def count_objects(a: int) -> int:
+        return len([object()]) + a
+
+    Toolbelt.tool(group="jit", jit=True)(count_objects)
+    with pytest.warns(RuntimeWarning, match="could not be compiled"):
+        assert Toolbelt.execute_sync("jit.count_objects", a=1) == 2
+    assert Toolbelt.execute_sync("jit.count_objects", a=2) == 3
+
+
 def test_type_conversion():
     """Test Python type to JSON schema type conversion"""
     assert Toolbelt._python_type_to_json(str) == "string"
@@ -154,6 +336,33 @@ async def test_execute_async_with_sync_tool():
     assert result == 24
 
 
+@pytest.mark.asyncio
+async def test_execute_async_inline_tool():
+    """Test that inline sync tools run on the event loop thread"""
+    result = await Toolbelt.execute_async("fast.thread_name")
+    assert result == threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_execute_async_threaded_sync_tool():
+    """Test that sync tools run in a worker thread by default"""
+
+    def worker_thread_name() -> str:
+        return threading.current_thread().name
+
+    Toolbelt.tool(group="threads")(worker_thread_name)
+    result = await Toolbelt.execute_async("threads.worker_thread_name")
+    assert result != threading.current_thread().name
+
+
+def test_sync_tool_stays_sync():
+    """Test that decorating a sync function keeps it directly callable"""
+    assert not Toolbelt._tool_definitions["math.multiply"].is_async
+    assert Toolbelt._tool_definitions["math.add"].is_async
+    assert multiply(x=2, y=3) == 6
+    assert "Error" in multiply(wrong_param=1)
+
+
 def test_execute_sync_with_async_tool():
     """Test executing async tools with execute_sync"""
     result = Toolbelt.execute_sync("math.add", a=5, b=3)
@@ -163,12 +372,69 @@ def test_execute_sync_with_async_tool():
     assert result == "HELLO"
 
 
+def test_unqualified_name_prefers_earliest_group():
+    """Test that unqualified names resolve by group creation order"""
+
+    def first_y() -> str:
+        return "A.y"
+
+    def later_b() -> str:
+        return "B.x"
+
+    def later_a() -> str:
+        return "A.x"
+
+    Toolbelt.tool(group="order_a", name="order_y")(first_y)
+    Toolbelt.tool(group="order_b", name="order_x")(later_b)
+    Toolbelt.tool(group="order_a", name="order_x")(later_a)
+    assert Toolbelt.execute_sync("order_x") == "A.x"
+    assert Toolbelt.execute_sync("order_b.order_x") == "B.x"
+
+
+def test_execute_sync_shares_background_loop():
+    """Test that execute_sync runs async tools on one background loop thread"""
+
+    async def loop_thread_name() -> str:
+        return threading.current_thread().name
+
+    Toolbelt.tool(group="loop")(loop_thread_name)
+    first = Toolbelt.execute_sync("loop.loop_thread_name")
+    second = Toolbelt.execute_sync("loop.loop_thread_name")
+    assert first == second
+    assert first != threading.current_thread().name
+
+
+def test_execute_sync_nested_in_async_tool():
+    """Test that an async tool calling execute_sync errors instead of hanging"""
+
+    async def nested() -> str:
+        return Toolbelt.execute_sync("math.add", a=1, b=2)
+
+    Toolbelt.tool(group="loop")(nested)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(Toolbelt.execute_sync("loop.nested")),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), "nested execute_sync deadlocked"
+    assert "Error" in results[0]
+
+
 def test_execute_sync_with_sync_tool():
     """Test executing sync tools with execute_sync"""
     result = Toolbelt.execute_sync("math.multiply", x=4, y=6)
     assert result == 24
 
 
+def test_execute_unqualified_name():
+    """Test that tools resolve without their group prefix"""
+    assert Toolbelt.execute_sync("multiply", x=4, y=6) == 24
+    assert Toolbelt.execute_sync("echo", message="hi") == "hi"
+    assert "Error" in Toolbelt.execute_sync("unknown")
+
+
 @pytest.mark.asyncio
 async def test_execute_async_errors():
     """Test error handling in execute_async"""
@@ -181,6 +447,15 @@ async def test_execute_async_errors():
     assert "Error" in result
 
 
+@pytest.mark.asyncio
+async def test_execute_async_as_task():
+    """Test that execute_async results can be scheduled as tasks"""
+    add_task = asyncio.create_task(Toolbelt.execute_async("math.add", a=1, b=2))
+    unknown_task = asyncio.create_task(Toolbelt.execute_async("unknown.tool"))
+    assert await add_task == 3
+    assert "Error" in await unknown_task
+
+
 def test_execute_sync_errors():
     """Test error handling in execute_sync"""
     # Unknown tool